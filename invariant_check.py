@@ -0,0 +1,253 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import random
+import re
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import virtual_pet as vp
+
+
+# --- Operations ---
+# Each step of a case is (op name, seed). The seed is applied right before the op, so any
+# subsequence of steps can be replayed on its own, which is what makes shrinking work.
+OPS = ["feed", "play", "clean", "rest", "grow", "auto_event", "interactive_event", "weekend_event", "catch_up", "save_load"]
+OP_WEIGHTS = [10, 10, 10, 6, 20, 15, 8, 8, 3, 1]
+STAT_LIMITS = {"hunger": 100, "happiness": 100, "health": 100, "stamina": 30}
+
+# (phrase, {stat: +1 must go up / -1 must go down, unless already at the limit})
+MESSAGE_EFFECTS = [
+    ("You fed", {"hunger": 1, "happiness": 1, "stamina": -1}),
+    ("You played with", {"happiness": 1, "hunger": -1, "stamina": -1}),
+    ("You bathed", {"health": 1, "happiness": 1, "stamina": -1}),
+    ("rested for a while", {"health": 1, "stamina": 1}),
+    ("seemed restless (Estrus)", {"happiness": -1}),
+    ("made a new friend", {"happiness": 1}),
+    ("rolled around in the mud", {"happiness": 1, "health": -1}),
+    ("small piece of chocolate", {"happiness": 1, "health": -1}),
+    ("found a tasty snack", {"happiness": 1, "hunger": 1}),
+    ("accidentally ingesting pesticide", {"health": -1}),
+    ("stamina +10", {"stamina": 1}),
+    ("Mood and health improved", {"happiness": 1, "health": 1}),
+    ("No eating!!! Mood greatly decreased", {"happiness": -1, "hunger": -1}),
+    ("Mood greatly decreased", {"happiness": -1}),
+    ("Hunger slightly increased", {"hunger": 1}),
+    ("Happiness slightly increased", {"happiness": 1}),
+    ("Happiness slightly decreased", {"happiness": -1}),
+]
+WEEKEND_CHANGE = re.compile(r"(\w+) randomly (?:increased|decreased) by 5 \(from (\d+) to (\d+)\)")
+WEEKEND_BOOST = re.compile(r"(\w+) was boosted to maximum \((\d+)\)")
+
+
+class Violation(Exception):
+    def __init__(self, kind, detail):
+        super().__init__(f"{kind}: {detail}")
+        self.kind = kind
+
+
+class MessageLog:
+    def __init__(self):
+        self.messages = []
+
+    def log_message(self, msg):
+        self.messages.append(msg)
+
+
+class CaseRunner:
+    def __init__(self, save_file):
+        self.save_file = save_file
+
+    def run(self, initial, steps):
+        """Runs one case. Returns the number of pet-days (grow steps) it covered, raises Violation on the first failure."""
+        pet = vp.Pet.from_dict(initial)
+        state = {"day": 1, "week": 1, "rested": False, "pet_days": 0}
+        for index, (op, seed) in enumerate(steps):
+            random.seed(seed)
+            before = pet.to_dict()
+            messages = self.apply(pet, op, state)
+            before = state.pop("checkpoint", before) # Set by ops whose messages describe only part of the step
+            try:
+                self.check(pet, op, before, messages)
+            except Violation as v:
+                v.step = index
+                raise
+        return state["pet_days"]
+
+    def apply(self, pet, op, state):
+        log = MessageLog()
+        if op in ("feed", "play", "clean"):
+            log.messages.append(getattr(pet, op)())
+        elif op == "rest":
+            msg, state["rested"] = pet.rest(state["rested"]); log.messages.append(msg)
+        elif op == "grow":
+            log.messages.extend(pet.grow())
+            state["rested"] = False; state["pet_days"] += 1
+            state["day"] += 1
+            if state["day"] > vp.DAYS_PER_WEEK: state["day"] = 1; state["week"] += 1
+        elif op == "auto_event":
+            log.messages.extend(vp.trigger_event_auto(pet, state["day"], log))
+        elif op == "interactive_event":
+            vp.trigger_event_interactive(pet, state["day"], log, ask=lambda *args, **kwargs: random.random() < 0.5)
+        elif op == "weekend_event":
+            vp.weekend_option_event(pet, log)
+        elif op == "catch_up": # One day of the real advance_days_on_load loop: grow, auto event and the lucky branch
+            if pet.alive: state["rested"] = False; state["pet_days"] += 1
+            def grow(): # grow changes stats without saying so, check the day's events against the grown pet
+                messages = vp.Pet.grow(pet); state["checkpoint"] = pet.to_dict(); return messages
+            pet.grow = grow
+            previous = vp.get_clock(); vp.set_clock(vp.FixedClock(datetime(2025, 1, 1)))
+            try:
+                last_time = vp.get_now() - timedelta(seconds=vp.DAY_DURATION)
+                _, state["day"], state["week"], _ = vp.advance_days_on_load(pet, last_time, state["day"], state["week"], log)
+            finally:
+                vp.set_clock(previous); del pet.grow
+        elif op == "save_load":
+            last_time = datetime(2025, 1, 1) + timedelta(days=state["pet_days"])
+            vp.save_pet_data(pet, state["day"], state["week"], last_time, self.save_file)
+            loaded, day, week, loaded_time = vp.load_pet_data(self.save_file)
+            if loaded is None or loaded.to_dict() != pet.to_dict() or (day, week, loaded_time) != (state["day"], state["week"], last_time):
+                raise Violation("save_load", f"saved {pet.to_dict()} day {state['day']} week {state['week']} {last_time}, "
+                                             f"loaded {loaded and loaded.to_dict()} day {day} week {week} {loaded_time}")
+        return log.messages
+
+    def check(self, pet, op, before, messages):
+        after = pet.to_dict()
+        for stat, limit in STAT_LIMITS.items():
+            if not 0 <= after[stat] <= limit:
+                raise Violation("bounds", f"{op}: {stat}={after[stat]} outside 0..{limit}")
+        if after["age"] < before["age"]: raise Violation("bounds", f"{op}: age went from {before['age']} to {after['age']}")
+        if before["alive"] is False and after["alive"] is True: raise Violation("revived", f"{op}: dead pet came back to life")
+        if not before["alive"] and after != before: raise Violation("dead_changed", f"{op}: dead pet changed {before} -> {after}")
+
+        roundtrip = vp.Pet.from_dict(after).to_dict()
+        if roundtrip != after: raise Violation("roundtrip", f"to_dict {after} came back as {roundtrip}")
+
+        expected = {}
+        for msg in messages:
+            for phrase, effects in MESSAGE_EFFECTS:
+                if phrase in msg:
+                    for stat, sign in effects.items(): expected.setdefault(stat, set()).add(sign)
+                    break
+            for attr, old, new in WEEKEND_CHANGE.findall(msg):
+                if (before[attr.lower()], after[attr.lower()]) != (int(old), int(new)):
+                    raise Violation("message", f"{msg.strip()!r} but {attr.lower()} went {before[attr.lower()]} -> {after[attr.lower()]}")
+            for attr, new in WEEKEND_BOOST.findall(msg):
+                if after[attr.lower()] != int(new):
+                    raise Violation("message", f"{msg.strip()!r} but {attr.lower()} is {after[attr.lower()]}")
+            if "passed away" in msg and after["alive"]:
+                raise Violation("message", f"{msg.strip()!r} but the pet is alive")
+        for stat, signs in expected.items():
+            if len(signs) != 1: continue # Several messages disagree about this stat, cannot attribute the change
+            sign, old, new = signs.pop(), before[stat], after[stat]
+            at_limit = old == (STAT_LIMITS[stat] if sign > 0 else 0)
+            if (new - old) * sign < 0 or (new == old and not at_limit):
+                raise Violation("message", f"{op} said {stat} {'up' if sign > 0 else 'down'} ({' | '.join(m.strip() for m in messages)}) "
+                                           f"but {stat} went {old} -> {new}")
+
+
+# --- Case Generation & Shrinking ---
+def random_case(rng, length):
+    initial = vp.Pet(f"P{rng.randrange(1000)}", rng.choice(["Dog", "Cat", "Bird"]), rng.choice(["Male", "Female"]),
+                     neutered=rng.random() < 0.3).to_dict()
+    for stat, limit in STAT_LIMITS.items(): initial[stat] = rng.randint(1, limit)
+    initial["age"] = rng.randint(1, 40)
+    steps = [(op, rng.randrange(2**32)) for op in rng.choices(OPS, OP_WEIGHTS, k=length)]
+    return initial, steps
+
+
+def fails_with(runner, initial, steps, kind):
+    try:
+        runner.run(initial, steps)
+    except Violation as v:
+        return v if v.kind == kind else None
+    return None
+
+
+def shrink(runner, initial, steps, violation):
+    """Delta-debugs the steps down to a minimal list that still fails the same way, then simplifies the initial pet."""
+    kind = violation.kind
+    steps = steps[:violation.step + 1]
+    chunk = len(steps) // 2
+    while chunk >= 1:
+        i, removed = 0, False
+        while i < len(steps):
+            candidate = steps[:i] + steps[i + chunk:]
+            if candidate and fails_with(runner, initial, candidate, kind):
+                steps, removed = candidate, True
+            else:
+                i += chunk
+        if not removed: chunk //= 2
+    default = vp.Pet(initial["name"], initial["species"], initial["gender"]).to_dict()
+    for key in ("neutered", "age") + tuple(STAT_LIMITS):
+        candidate = dict(initial, **{key: default[key]})
+        if fails_with(runner, candidate, steps, kind): initial = candidate
+    return initial, steps, fails_with(runner, initial, steps, kind)
+
+
+# --- Workers ---
+def run_batch(args):
+    seed, cases, length = args
+    rng = random.Random(seed)
+    fd, save_file = tempfile.mkstemp(suffix=".json", prefix="pet_check_"); os.close(fd)
+    runner = CaseRunner(save_file)
+    pet_days = steps_run = 0
+    try:
+        for _ in range(cases):
+            initial, steps = random_case(rng, length)
+            try:
+                pet_days += runner.run(initial, steps)
+                steps_run += len(steps)
+            except Violation as v:
+                initial, steps, v = shrink(runner, initial, steps, v)
+                return pet_days, steps_run, {"violation": str(v), "initial": initial, "steps": steps}
+    finally:
+        for path in (save_file, save_file + ".lock"):
+            if os.path.exists(path): os.remove(path)
+    return pet_days, steps_run, None
+
+
+def check(cases, length, workers=None, seed=0, batch_size=200):
+    batches = [(seed + i, min(batch_size, cases - start), length) for i, start in enumerate(range(0, cases, batch_size))]
+    pet_days = steps_run = 0
+    failures = []
+    start = time.perf_counter()
+    with mp.Pool(workers) as pool:
+        for days, ran, failure in pool.imap_unordered(run_batch, batches):
+            pet_days += days; steps_run += ran
+            if failure: failures.append(failure)
+    return pet_days, steps_run, failures, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Randomized invariant checks for the pet engine.")
+    parser.add_argument("--cases", type=int, default=2000)
+    parser.add_argument("--length", type=int, default=100, help="Steps per random case.")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--replay", help="JSON file with a failing case printed by an earlier run.")
+    args = parser.parse_args()
+
+    if args.replay:
+        with open(args.replay, "r", encoding="utf-8") as f: case = json.load(f)
+        fd, save_file = tempfile.mkstemp(suffix=".json"); os.close(fd)
+        try:
+            CaseRunner(save_file).run(case["initial"], [tuple(step) for step in case["steps"]])
+            print("Case passes.")
+        except Violation as v:
+            print(f"Case fails: {v}"); raise SystemExit(1)
+        finally:
+            for path in (save_file, save_file + ".lock"):
+                if os.path.exists(path): os.remove(path)
+        raise SystemExit(0)
+
+    seed = args.seed if args.seed is not None else random.randrange(2**31)
+    pet_days, steps_run, failures, elapsed = check(args.cases, args.length, args.workers, seed)
+    print(f"seed {seed}: {steps_run:,} steps, {pet_days:,} pet-days in {elapsed:.2f} s "
+          f"({pet_days / elapsed:,.0f} pet-days/s, {steps_run / elapsed:,.0f} steps/s)")
+    for failure in failures[:5]:
+        print(f"\nFAIL {failure['violation']}\nMinimal repro ({len(failure['steps'])} step(s)):")
+        print(json.dumps({"initial": failure["initial"], "steps": failure["steps"]}, ensure_ascii=False))
+    if failures: raise SystemExit(1)
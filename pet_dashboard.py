@@ -0,0 +1,242 @@
+import json
+import os
+from operator import itemgetter
+import tkinter as tk
+from tkinter import ttk
+
+from save_lock import locked
+from virtual_pet import PET_FILE, PETS_DIR, SAVE_LOCK_TIMEOUT, JSONDecodeError
+
+
+# Record layout used by the in-memory index (tuples keep 50k+ pets cheap to sort)
+NAME, SPECIES, AGE, HUNGER, HEALTH, ALIVE, PATH, SEARCH = range(8)
+COLUMNS = [ # (heading, record field, column width in pixels)
+    ("Name", NAME, 150), ("Species", SPECIES, 90), ("Age", AGE, 70),
+    ("Hunger", HUNGER, 80), ("Health", HEALTH, 80), ("Alive", ALIVE, 80),
+]
+PREVIEW_WIDTH = 130
+
+
+def list_save_files():
+    """Returns the main save file plus every *.json save in PETS_DIR."""
+    paths = []
+    if os.path.exists(PET_FILE): paths.append(PET_FILE)
+    if os.path.isdir(PETS_DIR):
+        with os.scandir(PETS_DIR) as entries:
+            paths.extend(sorted(e.path for e in entries if e.is_file() and e.name.endswith(".json")))
+    return paths
+
+
+class PetIndex:
+    """In-memory index of every saved pet. Sorting and filtering never touch the disk."""
+
+    def __init__(self):
+        self.records = []
+        self.view = [] # Filtered + sorted records shown by the dashboard
+        self.sort_field = NAME
+        self.sort_reverse = False
+        self.filter_text = ""
+
+    def load(self, paths):
+        records = []
+        for path in paths:
+            try:
+                with locked(path, exclusive=False, timeout=SAVE_LOCK_TIMEOUT): # Never read a save mid-write
+                    with open(path, "r", encoding="utf-8") as f:
+                        pet = json.load(f)["pet"]
+                name, species = str(pet["name"]), str(pet["species"])
+                records.append((name, species, pet["age"], pet["hunger"], pet["health"], bool(pet["alive"]),
+                                path, f"{name}\n{species}".casefold()))
+            except (JSONDecodeError, KeyError, TypeError, OSError) as e: # Skip, never delete, other saves. OSError covers SaveLockTimeout
+                print(f"Skipping unreadable save file {path}: {e}")
+        self.records = records
+        self.refresh()
+        return len(records)
+
+    def refresh(self):
+        text = self.filter_text.casefold()
+        rows = [r for r in self.records if text in r[SEARCH]] if text else list(self.records)
+        key = (lambda r: r[NAME].casefold()) if self.sort_field == NAME else itemgetter(self.sort_field, NAME)
+        rows.sort(key=key, reverse=self.sort_reverse)
+        self.view = rows
+
+    def sort_by(self, field):
+        if field == self.sort_field: self.sort_reverse = not self.sort_reverse
+        else: self.sort_field, self.sort_reverse = field, False
+        self.refresh()
+
+    def set_filter(self, text):
+        self.filter_text = text.strip()
+        self.refresh()
+
+
+class PetDashboard:
+    """Lists every saved pet. Only the visible rows have widgets; they are reused while scrolling."""
+    ROW_HEIGHT = 60
+
+    def __init__(self, app, index=None):
+        self.app = app
+        self.index = index or PetIndex()
+        self.top_row = 0 # Position in index.view shown by the first row widget
+        self.selected_path = None
+        self.rows = [] # Pool of (frame, [column labels], preview label)
+        self.preview_cache = {}
+
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Pet Dashboard"); self.window.geometry("900x600")
+        self.window.configure(bg=app.clr_bg_frame)
+        self.font_row = ("Verdana", 11)
+        self.font_preview = ("Courier New", 7)
+
+        # --- Toolbar ---
+        toolbar = ttk.Frame(self.window, padding=(10,10,10,5), style="TFrame"); toolbar.pack(fill=tk.X)
+        ttk.Label(toolbar, text="Filter:", style="Dialog.TLabel").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *_: self._apply_filter())
+        ttk.Entry(toolbar, textvariable=self.filter_var, font=app.font_main).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        ttk.Button(toolbar, text="Reload", command=self.reload).pack(side=tk.LEFT, padx=5)
+        self.count_label = ttk.Label(toolbar, text="", style="Dialog.TLabel"); self.count_label.pack(side=tk.LEFT, padx=5)
+
+        # --- Column Headers (click to sort) ---
+        header = tk.Frame(self.window, bg=app.clr_border); header.pack(fill=tk.X, padx=10)
+        self.header_buttons = {}
+        for col, (title, field, width) in enumerate(COLUMNS):
+            header.grid_columnconfigure(col, minsize=width)
+            b = tk.Button(header, text=title, font=self.font_row, relief="flat", bg=app.clr_button_bg, fg=app.clr_button_fg,
+                          activebackground=app.clr_button_active_bg, command=lambda f=field: self.sort_by(f))
+            b.grid(row=0, column=col, sticky="ew", padx=1, pady=1)
+            self.header_buttons[field] = (b, title)
+        header.grid_columnconfigure(len(COLUMNS), minsize=PREVIEW_WIDTH, weight=1)
+        tk.Label(header, text="Preview", font=self.font_row, bg=app.clr_border, fg=app.clr_text_subheader).grid(row=0, column=len(COLUMNS), sticky="ew")
+
+        # --- Virtualized Body ---
+        body = tk.Frame(self.window, bg=app.clr_bg_frame); body.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0,10))
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.viewport = tk.Frame(body, bg=app.clr_bg_labelframe_content)
+        self.viewport.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.viewport.bind("<Configure>", lambda e: self._ensure_rows(e.height))
+
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"): self.window.bind(seq, self._on_wheel)
+        for seq, delta in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "page-up"), ("<Next>", "page-down")):
+            self.window.bind(seq, lambda e, d=delta: self._on_key_scroll(d))
+        self.window.bind("<Return>", lambda e: self.open_selected())
+
+        if index is None: self.reload()
+        else: self._update_headers(); self.redraw()
+
+    # --- Data ---
+    def reload(self):
+        count = self.index.load(list_save_files())
+        self.app.log_message(f"Dashboard indexed {count} pet(s).")
+        self.top_row = 0
+        self._update_headers(); self.redraw()
+
+    def sort_by(self, field):
+        self.index.sort_by(field)
+        self.top_row = 0
+        self._update_headers(); self.redraw()
+
+    def _apply_filter(self):
+        self.index.set_filter(self.filter_var.get())
+        self.top_row = 0
+        self.redraw()
+
+    def _update_headers(self):
+        for field, (button, title) in self.header_buttons.items():
+            arrow = (" ▼" if self.index.sort_reverse else " ▲") if field == self.index.sort_field else ""
+            button.config(text=title + arrow)
+
+    def _art_preview(self, species, alive):
+        key = (species, alive)
+        if key not in self.preview_cache: # Same lookup rules as PetApp.update_pet_ascii_art
+            art_data = self.app.pet_ascii_art_data
+            species_art = art_data.get(species, art_data.get("_default_", {}))
+            pose = "idle" if alive else "sad"
+            self.preview_cache[key] = "\n".join(species_art.get(pose, species_art.get("idle", [])))
+        return self.preview_cache[key]
+
+    # --- Row Pool ---
+    def _visible_count(self):
+        return max(1, self.viewport.winfo_height() // self.ROW_HEIGHT)
+
+    def _ensure_rows(self, height):
+        needed = height // self.ROW_HEIGHT + 1
+        while len(self.rows) < needed:
+            self.rows.append(self._make_row(len(self.rows)))
+        self.redraw()
+
+    def _make_row(self, slot):
+        app = self.app
+        frame = tk.Frame(self.viewport, bg=app.clr_bg_labelframe_content)
+        frame.place(x=0, y=slot * self.ROW_HEIGHT, relwidth=1, height=self.ROW_HEIGHT)
+        labels = []
+        for col, (_, _, width) in enumerate(COLUMNS):
+            frame.grid_columnconfigure(col, minsize=width)
+            lbl = tk.Label(frame, font=self.font_row, anchor=tk.W, bg=app.clr_bg_labelframe_content, fg=app.clr_text_main)
+            lbl.grid(row=0, column=col, sticky="nsew", padx=2)
+            labels.append(lbl)
+        frame.grid_columnconfigure(len(COLUMNS), minsize=PREVIEW_WIDTH, weight=1)
+        frame.grid_rowconfigure(0, weight=1)
+        preview = tk.Label(frame, font=self.font_preview, justify=tk.LEFT, anchor=tk.W, bg=app.clr_ascii_bg, fg=app.clr_ascii_fg)
+        preview.grid(row=0, column=len(COLUMNS), sticky="nsew")
+        for widget in [frame, preview] + labels:
+            widget.bind("<Button-1>", lambda e, s=slot: self._select_slot(s))
+            widget.bind("<Double-Button-1>", lambda e, s=slot: self._select_slot(s, open_pet=True))
+        return frame, labels, preview
+
+    def redraw(self):
+        view = self.index.view
+        visible = self._visible_count()
+        self.top_row = max(0, min(self.top_row, len(view) - visible))
+        app = self.app
+        for slot, (frame, labels, preview) in enumerate(self.rows):
+            i = self.top_row + slot
+            if i >= len(view):
+                for lbl in labels: lbl.config(text="", bg=app.clr_bg_labelframe_content)
+                preview.config(text="")
+                continue
+            rec = view[i]
+            bg = app.clr_bg_root if rec[PATH] == self.selected_path else app.clr_bg_labelframe_content
+            texts = (rec[NAME], rec[SPECIES], f"{rec[AGE]} d", f"{rec[HUNGER]}/100", f"{rec[HEALTH]}/100",
+                     "Yes" if rec[ALIVE] else "No")
+            for lbl, text in zip(labels, texts): lbl.config(text=text, bg=bg)
+            preview.config(text=self._art_preview(rec[SPECIES], rec[ALIVE]))
+        total = len(view)
+        if total: self.scrollbar.set(self.top_row / total, min(1.0, (self.top_row + visible) / total))
+        else: self.scrollbar.set(0.0, 1.0)
+        self.count_label.config(text=f"{total} / {len(self.index.records)} pets")
+
+    # --- Scrolling & Selection ---
+    def _scroll_to(self, row):
+        row = max(0, min(row, len(self.index.view) - self._visible_count()))
+        if row != self.top_row:
+            self.top_row = row
+            self.redraw()
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto": self._scroll_to(int(float(args[1]) * len(self.index.view)))
+        elif args[0] == "scroll":
+            step = self._visible_count() if args[2] == "pages" else 1
+            self._scroll_to(self.top_row + int(args[1]) * step)
+
+    def _on_wheel(self, event):
+        if event.num == 4: delta = -3
+        elif event.num == 5: delta = 3
+        else: delta = -3 if event.delta > 0 else 3
+        self._scroll_to(self.top_row + delta)
+
+    def _on_key_scroll(self, delta):
+        if delta == "page-up": delta = -self._visible_count()
+        elif delta == "page-down": delta = self._visible_count()
+        self._scroll_to(self.top_row + delta)
+
+    def _select_slot(self, slot, open_pet=False):
+        i = self.top_row + slot
+        if i >= len(self.index.view): return
+        self.selected_path = self.index.view[i][PATH]
+        self.redraw()
+        if open_pet: self.open_selected()
+
+    def open_selected(self):
+        if self.selected_path: self.app.open_pet_file(self.selected_path)
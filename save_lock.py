@@ -0,0 +1,117 @@
+import os
+import time
+from contextlib import contextmanager
+
+# Attempt to import fcntl (POSIX only)
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+LOCK_SUFFIX = ".lock" # Locks live in a sidecar file so the save itself can be replaced or deleted
+SLOW_LOCK_SECONDS = 0.05
+
+
+class SaveLockTimeout(TimeoutError):
+    pass
+
+
+class SaveConflictError(Exception):
+    """The save on disk has a different version than the one the caller last saw."""
+    def __init__(self, path, expected_version, disk_version):
+        super().__init__(f"{path} is at version {disk_version}, expected {expected_version}.")
+        self.path = path
+        self.expected_version = expected_version
+        self.disk_version = disk_version
+
+
+class LockStats:
+    def __init__(self):
+        self.slow = 0
+        self.last_slow = None # (path, hold) of the most recent slow lock
+
+    def record(self, path, hold):
+        if hold > SLOW_LOCK_SECONDS:
+            self.slow += 1
+            self.last_slow = (path, hold)
+
+LOCK_STATS = LockStats()
+
+
+def _acquire(path, exclusive, timeout, start):
+    """Opens and locks the sidecar. Returns its fd, or None for a reader when there is no sidecar to lock."""
+    lock_path = path + LOCK_SUFFIX
+    mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+    while True:
+        try: # Readers never create the sidecar, only writers do
+            fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644) if exclusive else os.open(lock_path, os.O_RDONLY)
+        except FileNotFoundError:
+            return None # Writers replace the save atomically, so reading it unlocked is safe
+        try:
+            if timeout is None:
+                fcntl.flock(fd, mode)
+            else:
+                deadline = start + timeout
+                while True:
+                    try:
+                        fcntl.flock(fd, mode | fcntl.LOCK_NB); break
+                    except BlockingIOError:
+                        if time.perf_counter() >= deadline: raise SaveLockTimeout(f"Timed out waiting for lock on {path}.")
+                        time.sleep(0.005)
+            try: # remove_lock() may have unlinked the sidecar while we waited, then this lock guards nothing
+                if os.fstat(fd).st_ino == os.stat(lock_path).st_ino: return fd
+            except FileNotFoundError:
+                pass
+        except BaseException:
+            os.close(fd); raise
+        os.close(fd)
+
+
+@contextmanager
+def locked(path, exclusive=True, timeout=None):
+    """Advisory lock around a save file. `timeout=None` blocks, otherwise raises SaveLockTimeout after `timeout` seconds."""
+    start = time.perf_counter()
+    if not FCNTL_AVAILABLE: # No advisory locks on this platform, still measure hold times
+        try: yield
+        finally: LOCK_STATS.record(path, time.perf_counter() - start)
+        return
+    fd = _acquire(path, exclusive, timeout, start)
+    acquired = time.perf_counter()
+    try:
+        yield
+    finally:
+        LOCK_STATS.record(path, time.perf_counter() - acquired)
+        if fd is not None: os.close(fd) # Closing the fd releases the lock
+
+
+def remove_lock(path):
+    """Deletes the sidecar of a save that is being deleted. Call while holding the exclusive lock."""
+    try: os.remove(path + LOCK_SUFFIX)
+    except FileNotFoundError: pass
+
+
+class SaveWatcher:
+    """Detects changes to a save file by polling os.stat, which is much cheaper than reading it."""
+    def __init__(self, path):
+        self.path = path
+        self.signature = self._stat()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size, st.st_ino
+        except FileNotFoundError:
+            return None
+
+    def changed(self):
+        signature = self._stat()
+        if signature == self.signature: return False
+        self.signature = signature
+        return True
+
+    def exists(self):
+        return self.signature is not None
+
+    def sync(self): # Call after our own writes so they aren't reported as external changes
+        self.signature = self._stat()
@@ -0,0 +1,219 @@
+import argparse
+import multiprocessing as mp
+import os
+import random
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+
+from virtual_pet import Pet, trigger_event_auto, DAYS_PER_WEEK
+
+
+# --- Block Layout ---
+# Header: magic, record count, record size. Records follow back to back, one per pet.
+HEADER = struct.Struct("<8sII")
+MAGIC = b"PETPOP2\0"
+NAME_BYTES = 15 * 4 # Names are up to 15 characters, each up to 4 bytes of UTF-8
+# name, species, gender, then hunger, happiness, health, age, stamina, alive, neutered, current_day, current_week
+RECORD = struct.Struct(f"<{NAME_BYTES}s8s8s9i")
+_TEXT_FIELDS = (("name", 0, NAME_BYTES), ("species", NAME_BYTES, 8), ("gender", NAME_BYTES + 8, 8))
+_INT_OFFSET = NAME_BYTES + 16
+_INT_FIELDS = ("hunger", "happiness", "health", "age", "stamina", "alive", "neutered", "current_day", "current_week")
+_BOOL_FIELDS = ("alive", "neutered")
+
+
+class _TextField:
+    def __init__(self, offset, size):
+        self.fmt = f"<{size}s"; self.offset = offset; self.size = size
+
+    def __get__(self, rec, owner=None):
+        if rec is None: return self
+        raw = struct.unpack_from(self.fmt, rec.buf, rec.base + self.offset)[0]
+        return raw.rstrip(b"\0").decode("utf-8", errors="ignore")
+
+    def __set__(self, rec, value):
+        raw = str(value).encode("utf-8")
+        if len(raw) > self.size: raise ValueError(f"{value!r} does not fit in {self.size} bytes.")
+        struct.pack_into(self.fmt, rec.buf, rec.base + self.offset, raw)
+
+
+class _IntField:
+    def __init__(self, offset, as_bool=False):
+        self.offset = offset; self.as_bool = as_bool
+
+    def __get__(self, rec, owner=None):
+        if rec is None: return self
+        value = struct.unpack_from("<i", rec.buf, rec.base + self.offset)[0]
+        return bool(value) if self.as_bool else value
+
+    def __set__(self, rec, value):
+        struct.pack_into("<i", rec.buf, rec.base + self.offset, int(value))
+
+
+class PetRecord:
+    """A Pet-compatible view over one record of a shared block. Reads and writes go straight to the buffer."""
+    grow = Pet.grow
+    to_dict = Pet.to_dict
+    pet_id = None # Archive ids are not kept in the shared block
+
+    def __init__(self, buf, index):
+        self.buf = buf
+        self.base = HEADER.size + index * RECORD.size
+
+    def load(self, pet, current_day=1, current_week=1):
+        for attr in ("name", "species", "gender") + _INT_FIELDS[:-2]:
+            setattr(self, attr, getattr(pet, attr))
+        self.current_day = current_day; self.current_week = current_week
+
+for _name, _offset, _size in _TEXT_FIELDS:
+    setattr(PetRecord, _name, _TextField(_offset, _size))
+for _i, _name in enumerate(_INT_FIELDS):
+    setattr(PetRecord, _name, _IntField(_INT_OFFSET + 4 * _i, _name in _BOOL_FIELDS))
+
+
+def simulate_day(pet):
+    """One day of the advance_days_on_load loop, with the messages discarded."""
+    if not pet.alive: return
+    pet.grow()
+    trigger_event_auto(pet, pet.current_day, None)
+    if pet.alive and random.random() < 0.1:
+        pet.stamina = min(30, pet.stamina + 10)
+    pet.current_day += 1
+    if pet.current_day > DAYS_PER_WEEK:
+        pet.current_week += 1
+        pet.current_day = 1
+
+
+def _worker(shm_name, start, stop, days, barrier, seed):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    random.seed(seed) # Always reseed, forked workers would otherwise share one random state
+    try:
+        records = [PetRecord(shm.buf, i) for i in range(start, stop)]
+        for _ in range(days):
+            for rec in records: simulate_day(rec)
+            barrier.wait()
+        del records
+    except threading.BrokenBarrierError: # Another worker failed, its own exit code reports it
+        pass
+    except BaseException:
+        barrier.abort() # Release the other workers instead of leaving them waiting forever
+        raise
+    finally:
+        shm.close()
+
+
+# --- Shared Population ---
+class SharedPopulation:
+    def __init__(self, count, name=None, create=True):
+        self.count = count
+        self.size = HEADER.size + count * RECORD.size
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self.size)
+            HEADER.pack_into(self.shm.buf, 0, MAGIC, count, RECORD.size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.owner = create
+
+    @classmethod
+    def from_pets(cls, pets, current_day=1, current_week=1):
+        population = cls(len(pets))
+        try:
+            for i, pet in enumerate(pets): population.record(i).load(pet, current_day, current_week)
+        except BaseException:
+            population.close(); raise
+        return population
+
+    @classmethod
+    def from_snapshot(cls, path):
+        with open(path, "rb") as f: data = f.read()
+        magic, count, record_size = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or record_size != RECORD.size:
+            raise ValueError(f"{path} is not a pet population snapshot.")
+        population = cls(count)
+        population.shm.buf[:population.size] = data[:population.size]
+        return population
+
+    def record(self, index):
+        if not 0 <= index < self.count: raise IndexError(index)
+        return PetRecord(self.shm.buf, index)
+
+    def to_pets(self):
+        return [Pet.from_dict(self.record(i).to_dict()) for i in range(self.count)]
+
+    def snapshot(self, path):
+        """Writes the whole block to disk with a single write call."""
+        with open(path, "wb") as f: f.write(self.shm.buf[:self.size])
+
+    def run(self, days, workers=None, seed=None):
+        """Advances every pet by `days` days. Each worker owns a slice and waits for the others at the end of each day."""
+        workers = max(1, min(workers or os.cpu_count() or 1, self.count or 1))
+        base_seed = seed if seed is not None else random.randrange(2**32)
+        barrier = mp.Barrier(workers)
+        step = -(-self.count // workers)
+        procs = [mp.Process(target=_worker, args=(self.shm.name, i * step, min(self.count, (i + 1) * step), days, barrier, base_seed + i))
+                 for i in range(workers)]
+        for p in procs: p.start()
+        while any(p.is_alive() for p in procs):
+            for p in procs: p.join(timeout=0.1)
+            if any(p.exitcode not in (None, 0) for p in procs): barrier.abort() # Covers workers killed before they could abort
+        failed = [p.exitcode for p in procs if p.exitcode != 0]
+        if failed: raise RuntimeError(f"{len(failed)} simulation worker(s) failed (exit codes {failed}).")
+
+    def close(self):
+        self.shm.close()
+        if self.owner: self.shm.unlink()
+
+    def __enter__(self): return self
+
+    def __exit__(self, *exc): self.close()
+
+
+# --- Benchmark ---
+def _pickle_chunk(pets):
+    for pet in pets: simulate_day(pet)
+    return pets
+
+
+def make_pets(count):
+    species = ["Dog", "Cat", "Bird"]
+    pets = []
+    for i in range(count):
+        pet = Pet(f"Pet{i}", random.choice(species), random.choice(["Male", "Female"]))
+        pet.hunger = random.randint(60, 100); pet.health = random.randint(60, 100)
+        pet.current_day = 1; pet.current_week = 1
+        pets.append(pet)
+    return pets
+
+
+def benchmark(count=20000, days=30, workers=None):
+    workers = workers or os.cpu_count() or 1
+    pets = make_pets(count)
+
+    start = time.perf_counter()
+    with SharedPopulation.from_pets(pets) as population:
+        population.run(days, workers)
+    shared_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    step = -(-count // workers)
+    with mp.Pool(workers) as pool:
+        for _ in range(days):
+            chunks = pool.map(_pickle_chunk, [pets[i:i + step] for i in range(0, count, step)])
+            pets = [pet for chunk in chunks for pet in chunk]
+    pickle_time = time.perf_counter() - start
+
+    pet_days = count * days
+    print(f"{count} pets x {days} days, {workers} worker(s)")
+    print(f"  shared memory: {shared_time:.3f} s ({pet_days / shared_time:,.0f} pet-days/s)")
+    print(f"  pickle pool:   {pickle_time:.3f} s ({pet_days / pickle_time:,.0f} pet-days/s)")
+    return shared_time, pickle_time
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare shared-memory and pickle-based pet simulation.")
+    parser.add_argument("--pets", type=int, default=20000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    benchmark(args.pets, args.days, args.workers)
@@ -0,0 +1,312 @@
+import argparse
+import json
+import math
+import multiprocessing as mp
+import random
+from collections import Counter
+from datetime import timedelta
+
+from virtual_pet import (Pet, get_now, advance_days_on_load, weekend_option_event, classify_event,
+                         DAY_DURATION, EVENT_KEYS, MAX_CATCH_UP_DAYS)
+
+
+STAT_NAMES = ["hunger", "happiness", "health", "stamina"]
+
+
+# --- Mergeable Summaries ---
+class RunningStats:
+    """Online count/mean/variance. Integer inputs are summed exactly, so merges are exact too."""
+
+    def __init__(self):
+        self.count = 0; self.total = 0; self.total_sq = 0
+        self.min = None; self.max = None
+
+    def add(self, x):
+        self.count += 1; self.total += x; self.total_sq += x * x
+        self.min = x if self.min is None else min(self.min, x)
+        self.max = x if self.max is None else max(self.max, x)
+
+    def merge(self, other):
+        self.count += other.count; self.total += other.total; self.total_sq += other.total_sq
+        for attr, pick in (("min", min), ("max", max)):
+            values = [v for v in (getattr(self, attr), getattr(other, attr)) if v is not None]
+            setattr(self, attr, pick(values) if values else None)
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def variance(self):
+        if self.count < 2: return 0.0
+        return (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+
+    def to_dict(self):
+        return {"count": self.count, "total": self.total, "total_sq": self.total_sq, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count, stats.total, stats.total_sq = data["count"], data["total"], data["total_sq"]
+        stats.min, stats.max = data["min"], data["max"]
+        return stats
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch for non-negative values. Buckets only hold counts, so merging is exact."""
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = Counter()
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, x):
+        self.count += 1
+        if x <= 0: self.zero_count += 1
+        else: self.buckets[math.ceil(math.log(x) / self.log_gamma)] += 1
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge quantile sketches with different accuracy.")
+        self.buckets.update(other.buckets)
+        self.zero_count += other.zero_count; self.count += other.count
+        return self
+
+    def quantile(self, q):
+        if not self.count: return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen: return 0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen: return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self):
+        return {"relative_accuracy": self.relative_accuracy, "zero_count": self.zero_count,
+                "buckets": {str(k): v for k, v in self.buckets.items()}}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["relative_accuracy"])
+        sketch.zero_count = data["zero_count"]
+        sketch.buckets = Counter({int(k): v for k, v in data["buckets"].items()})
+        sketch.count = sketch.zero_count + sum(sketch.buckets.values())
+        return sketch
+
+
+class Histogram:
+    """Fixed-width bins over [low, high]; values outside the range go to the edge bins."""
+
+    def __init__(self, low, high, bins):
+        self.low, self.high, self.bins = low, high, bins
+        self.counts = [0] * bins
+
+    def add(self, x):
+        i = int((x - self.low) * self.bins / (self.high - self.low))
+        self.counts[max(0, min(self.bins - 1, i))] += 1
+
+    def merge(self, other):
+        if (other.low, other.high, other.bins) != (self.low, self.high, self.bins):
+            raise ValueError("Cannot merge histograms with different bins.")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        return self
+
+    def bin_edges(self):
+        width = (self.high - self.low) / self.bins
+        return [(self.low + i * width, self.low + (i + 1) * width) for i in range(self.bins)]
+
+    def to_dict(self):
+        return {"low": self.low, "high": self.high, "bins": self.bins, "counts": list(self.counts)}
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls(data["low"], data["high"], data["bins"])
+        hist.counts = list(data["counts"])
+        return hist
+
+
+class MetricSummary:
+    def __init__(self, low, high, bins=10):
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch()
+        self.histogram = Histogram(low, high, bins)
+
+    def add(self, x):
+        self.stats.add(x); self.sketch.add(x); self.histogram.add(x)
+
+    def merge(self, other):
+        self.stats.merge(other.stats); self.sketch.merge(other.sketch); self.histogram.merge(other.histogram)
+        return self
+
+    def report(self):
+        s = self.stats
+        return {
+            "count": s.count, "mean": s.mean, "variance": s.variance, "stddev": math.sqrt(s.variance),
+            "min": s.min, "max": s.max,
+            "p50": self.sketch.quantile(0.5), "p90": self.sketch.quantile(0.9), "p99": self.sketch.quantile(0.99),
+            "histogram": self.histogram.to_dict(),
+        }
+
+    def to_dict(self):
+        return {"stats": self.stats.to_dict(), "sketch": self.sketch.to_dict(), "histogram": self.histogram.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls.__new__(cls)
+        summary.stats = RunningStats.from_dict(data["stats"])
+        summary.sketch = QuantileSketch.from_dict(data["sketch"])
+        summary.histogram = Histogram.from_dict(data["histogram"])
+        return summary
+
+
+# --- Aggregator ---
+class SimulationAggregator:
+    """Folds per-pet outcomes into fixed-size summaries. Memory does not grow with the number of pets."""
+
+    def __init__(self, max_days=365):
+        self.max_days = max_days
+        self.pets = 0
+        self.deaths = 0
+        self.lifespan = MetricSummary(0, max_days, 20)
+        self.final = {name: MetricSummary(0, 30 if name == "stamina" else 100) for name in STAT_NAMES}
+        self.events = Counter() # Times each branch fired
+        self.pets_with_event = Counter() # Pets that saw each branch at least once
+
+    def add_outcome(self, pet, events):
+        """`pet` is the pet after its run, `events` a Counter of EVENT_KEYS it triggered."""
+        self.pets += 1
+        if not pet.alive: self.deaths += 1
+        self.lifespan.add(pet.age)
+        for name in STAT_NAMES: self.final[name].add(getattr(pet, name))
+        self.events.update(events)
+        self.pets_with_event.update(events.keys())
+
+    def merge(self, other):
+        if other.max_days != self.max_days: raise ValueError("Cannot merge aggregators with different max_days.")
+        self.pets += other.pets; self.deaths += other.deaths
+        self.lifespan.merge(other.lifespan)
+        for name in STAT_NAMES: self.final[name].merge(other.final[name])
+        self.events.update(other.events); self.pets_with_event.update(other.pets_with_event)
+        return self
+
+    def to_dict(self):
+        return {
+            "max_days": self.max_days, "pets": self.pets, "deaths": self.deaths,
+            "lifespan": self.lifespan.to_dict(), "final": {k: v.to_dict() for k, v in self.final.items()},
+            "events": dict(self.events), "pets_with_event": dict(self.pets_with_event),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        agg = cls(data["max_days"])
+        agg.pets, agg.deaths = data["pets"], data["deaths"]
+        agg.lifespan = MetricSummary.from_dict(data["lifespan"])
+        agg.final = {k: MetricSummary.from_dict(v) for k, v in data["final"].items()}
+        agg.events = Counter(data["events"]); agg.pets_with_event = Counter(data["pets_with_event"])
+        return agg
+
+    def report(self):
+        return {
+            "pets": self.pets, "deaths": self.deaths, "max_days": self.max_days,
+            "lifespan": self.lifespan.report(),
+            "final_stats": {k: v.report() for k, v in self.final.items()},
+            "events": {key: {"count": self.events[key], "pets": self.pets_with_event[key],
+                             "pet_rate": self.pets_with_event[key] / self.pets if self.pets else 0.0}
+                       for key in EVENT_KEYS},
+        }
+
+    def ascii_charts(self, width=30):
+        """Returns the report charts as a list of lines, boxed like the pet art."""
+        lines = []
+        lines += _ascii_box(f"Lifespan (days) - {self.pets} pets, {self.deaths} died", _histogram_rows(self.lifespan.histogram, width))
+        for name in STAT_NAMES:
+            lines += _ascii_box(f"Final {name}", _histogram_rows(self.final[name].histogram, width))
+        counts = [(key, self.events[key]) for key in EVENT_KEYS]
+        lines += _ascii_box("Event frequency", _bar_rows(counts, width))
+        return lines
+
+
+def _bar_rows(labelled_counts, width):
+    peak = max([c for _, c in labelled_counts] + [1])
+    label_width = max(len(label) for label, _ in labelled_counts)
+    return [f"{label:>{label_width}} |{'#' * round(width * c / peak):<{width}}| {c}" for label, c in labelled_counts]
+
+
+def _histogram_rows(hist, width):
+    return _bar_rows([(f"{lo:g}-{hi:g}", c) for (lo, hi), c in zip(hist.bin_edges(), hist.counts)], width)
+
+
+def _ascii_box(title, rows):
+    inner = max(len(title), *(len(r) for r in rows))
+    return ([" ." + "-" * (inner + 2) + ".", f" | {title:<{inner}} |", " |" + "~" * (inner + 2) + "|"]
+            + [f" | {r:<{inner}} |" for r in rows] + [" `" + "-" * (inner + 2) + "'", ""])
+
+
+# --- Bulk Runs ---
+class EventRecorder:
+    """Stands in for PetApp in the day loop, counting event messages instead of logging them."""
+
+    def __init__(self):
+        self.events = Counter()
+
+    def log_message(self, msg):
+        key = classify_event(msg)
+        if key: self.events[key] += 1
+
+
+def simulate_pet(pet, days):
+    """Runs `pet` through the advance_days_on_load catch-up loop for `days` days. Returns the event Counter."""
+    recorder = EventRecorder()
+    current_day, current_week = 1, 1
+    while days > 0 and pet.alive: # The loop caps each catch-up at MAX_CATCH_UP_DAYS, so run longer spans in pieces
+        chunk = min(days, MAX_CATCH_UP_DAYS); days -= chunk
+        last_time = get_now() - timedelta(seconds=chunk * DAY_DURATION)
+        pet, current_day, current_week, _ = advance_days_on_load(pet, last_time, current_day, current_week, recorder)
+    if pet.alive and current_day >= 5: weekend_option_event(pet, recorder) # As PetApp.load_game does
+    return recorder.events
+
+
+def random_pet(rng, i):
+    pet = Pet(f"Pet{i}", rng.choice(["Dog", "Cat", "Bird"]), rng.choice(["Male", "Female"]), neutered=rng.random() < 0.5)
+    pet.hunger = rng.randint(20, 100); pet.happiness = rng.randint(20, 100); pet.health = rng.randint(40, 100)
+    return pet
+
+
+def run_chunk(args):
+    start, count, days, seed = args
+    random.seed(seed)
+    agg = SimulationAggregator(days)
+    for i in range(start, start + count):
+        pet = random_pet(random, i)
+        agg.add_outcome(pet, simulate_pet(pet, days))
+    return agg.to_dict()
+
+
+def run_bulk(pets, days=365, workers=None, chunk_size=1000, seed=0):
+    """Simulates `pets` random pets across worker processes and merges their partial aggregates."""
+    chunks = [(start, min(chunk_size, pets - start), days, seed + start) for start in range(0, pets, chunk_size)]
+    total = SimulationAggregator(days)
+    with mp.Pool(workers) as pool:
+        for partial in pool.imap_unordered(run_chunk, chunks):
+            total.merge(SimulationAggregator.from_dict(partial))
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate many pets and print aggregate statistics.")
+    parser.add_argument("--pets", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report", default="sim_report.json", help="Where to write the JSON report.")
+    args = parser.parse_args()
+    aggregate = run_bulk(args.pets, args.days, args.workers, seed=args.seed)
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(aggregate.report(), f, ensure_ascii=False, indent=2)
+    print("\n".join(aggregate.ascii_charts()))
+    print(f"Report written to {args.report}")
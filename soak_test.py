@@ -0,0 +1,171 @@
+import argparse
+import contextlib
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import virtual_pet as vp
+
+
+def rss_bytes():
+    """Current resident set size, or None where /proc is not available."""
+    try:
+        with open("/proc/self/statm") as f: return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class TextBuffer:
+    """The part of the tk.Text interface PetApp.log_message uses, for machines without a display.
+    It keeps every line it is given, so only the trimming in PetApp.log_message bounds it."""
+    def __init__(self):
+        self.lines = [""] # Like tk.Text: the last entry is the line being typed
+
+    def winfo_exists(self): return True
+
+    def config(self, **options): pass
+
+    def see(self, index): pass
+
+    def insert(self, index, text):
+        parts = text.split("\n")
+        self.lines[-1] += parts[0]
+        self.lines.extend(parts[1:])
+
+    def index(self, index): # Only "end-1c" is used
+        return f"{len(self.lines)}.{len(self.lines[-1])}"
+
+    def delete(self, start, end): # Only whole lines from "1.0" are deleted
+        del self.lines[:int(end.split(".")[0]) - 1]
+
+
+class WidgetLog:
+    """Logs through PetApp.log_message into a hidden ScrolledText, or a TextBuffer when Tk cannot start."""
+    def __init__(self, headless=False):
+        self.root = None
+        if not headless:
+            try:
+                self.root = vp.tk.Tk(); self.root.withdraw()
+            except vp.tk.TclError as e:
+                print(f"Tk unavailable ({e}), logging into a headless text buffer.")
+        if self.root: self.message_log = vp.scrolledtext.ScrolledText(self.root, state=vp.tk.DISABLED)
+        else: self.message_log = TextBuffer()
+
+    def log_message(self, msg):
+        vp.PetApp.log_message(self, msg)
+
+    def line_count(self):
+        return int(self.message_log.index("end-1c").split(".")[0]) - 1
+
+
+def care_for(pet):
+    """A player session: rest, then spend the day's stamina on whatever the pet needs most."""
+    pet.rest(False)
+    for _ in range(3):
+        if pet.hunger < 70: pet.feed()
+        elif pet.health < 70: pet.clean()
+        else: pet.play()
+
+
+def run_soak(days, pet_file, log, clock, max_gap=3, sample_every=50, seconds_per_day=None):
+    """Plays `days` simulated days through the load -> catch-up -> save cycle. Returns one sample dict per `sample_every` sessions."""
+    samples = []
+    timings = {"load": 0.0, "advance": 0.0, "save": 0.0}
+    sessions = deaths = 0
+    pet = vp.Pet("Soak", "Dog", "Male")
+    vp.save_pet_data(pet, 1, 1, clock.now(), pet_file)
+    simulated = 0
+    while simulated < days:
+        gap = random.randint(1, max_gap)
+        if seconds_per_day: time.sleep(gap * seconds_per_day) # ScaledClock moves by itself
+        else: clock.advance(days=gap)
+        simulated += gap
+
+        t0 = time.perf_counter()
+        pet, day, week, last_time = vp.load_pet_data(pet_file)
+        t1 = time.perf_counter()
+        pet, day, week, last_time = vp.advance_days_on_load(pet, last_time, day, week, log)
+        if pet.alive and day >= 5: vp.weekend_option_event(pet, log)
+        t2 = time.perf_counter()
+        if pet.alive: care_for(pet)
+        else:
+            deaths += 1
+            pet = vp.Pet(f"Soak{deaths}", random.choice(["Dog", "Cat", "Bird"]), "Female")
+        vp.save_pet_data(pet, day, week, last_time, pet_file)
+        t3 = time.perf_counter()
+
+        sessions += 1
+        timings["load"] = max(timings["load"], t1 - t0)
+        timings["advance"] = max(timings["advance"], t2 - t1)
+        timings["save"] = max(timings["save"], t3 - t2)
+        if sessions % sample_every == 0 or simulated >= days:
+            current, _ = tracemalloc.get_traced_memory()
+            samples.append({
+                "session": sessions, "sim_days": simulated, "deaths": deaths,
+                "load_ms": timings["load"] * 1000, "advance_ms": timings["advance"] * 1000, "save_ms": timings["save"] * 1000,
+                "py_heap_kb": current / 1024, "rss_kb": (rss_bytes() or 0) / 1024, "log_lines": log.line_count(),
+            })
+            timings = dict.fromkeys(timings, 0.0)
+    return samples
+
+
+WARMUP_DAYS = 365 # Ignored by the leak verdict: caches fill and the log reaches LOG_MAX_LINES in this time
+MIN_MEASURED_DAYS = 2 * 365 # Shorter measured spans are too noisy to call a leak
+
+
+def growth_per_1000_days(samples, key):
+    """Least-squares slope of `key` over the samples after WARMUP_DAYS."""
+    tail = [s for s in samples if s["sim_days"] >= WARMUP_DAYS]
+    if len(tail) < 2: return 0.0
+    xs = [s["sim_days"] for s in tail]; ys = [s[key] for s in tail]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    denom = sum((x - mx) ** 2 for x in xs)
+    return 1000 * sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / denom if denom else 0.0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a pet through years of simulated time and watch latency and memory.")
+    parser.add_argument("--years", type=float, default=5)
+    parser.add_argument("--seconds-per-day", type=float, default=None,
+                        help="Use a ScaledClock (e.g. 0.001) instead of stepping a FixedClock.")
+    parser.add_argument("--headless", action="store_true", help="Log into a TextBuffer even if Tk can start.")
+    parser.add_argument("--sample-every", type=int, default=50)
+    parser.add_argument("--max-heap-growth-kb", type=float, default=64,
+                        help="Fail if the Python heap grows faster than this per 1000 simulated days.")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    clock = vp.ScaledClock(args.seconds_per_day) if args.seconds_per_day else vp.FixedClock()
+    vp.set_clock(clock)
+    log = WidgetLog(args.headless)
+    days = int(args.years * 365)
+    pet_file = os.path.join(tempfile.mkdtemp(prefix="pet_soak_"), "soak_pet.json")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull): # PetApp.log_message also prints
+        samples = run_soak(days, pet_file, log, clock, sample_every=args.sample_every, seconds_per_day=args.seconds_per_day)
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    columns = ["session", "sim_days", "deaths", "load_ms", "advance_ms", "save_ms", "py_heap_kb", "rss_kb", "log_lines"]
+    print(" ".join(f"{c:>10}" for c in columns))
+    for s in samples:
+        print(" ".join(f"{s[c]:>10.2f}" if isinstance(s[c], float) else f"{s[c]:>10}" for c in columns))
+    heap_growth = growth_per_1000_days(samples, "py_heap_kb")
+    log_growth = growth_per_1000_days(samples, "log_lines")
+    print(f"\n{days} simulated days in {elapsed:.2f} s ({days / elapsed:,.0f} days/s)")
+    print(f"Python heap growth: {heap_growth:.1f} KB / 1000 days, RSS growth: {growth_per_1000_days(samples, 'rss_kb'):.1f} KB / 1000 days, "
+          f"log lines growth: {log_growth:.0f} / 1000 days")
+    if days < WARMUP_DAYS + MIN_MEASURED_DAYS:
+        print(f"Run shorter than {(WARMUP_DAYS + MIN_MEASURED_DAYS) / 365:g} years, no leak verdict.")
+        raise SystemExit(0)
+    failed = False
+    if heap_growth > args.max_heap_growth_kb:
+        print(f"FAIL: heap growth above {args.max_heap_growth_kb} KB / 1000 days, possible leak."); failed = True
+    if log_growth > 0:
+        print("FAIL: the log keeps growing after warm-up, it is not being trimmed."); failed = True
+    if failed: raise SystemExit(1)
@@ -0,0 +1,272 @@
+import argparse
+import json
+import operator
+import os
+import time
+from array import array
+from math import prod
+
+from save_lock import locked
+
+# Attempt to import numpy (only needed for queries)
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+ARCHIVE_DIR = "pet_archive"
+REGISTRY_FILE = "pets.json" # pet_id -> name/species, inside the archive directory
+UNKNOWN_SPECIES = "unknown" # Query group for rows whose pet_id is not in the registry
+# (column, array typecode, numpy dtype). One native-endian fixed-width file per column.
+COLUMNS = [
+    ("pet_id", "I", "=u4"), ("day", "B", "u1"), ("week", "I", "=u4"),
+    ("hunger", "B", "u1"), ("happiness", "B", "u1"), ("health", "B", "u1"), ("stamina", "B", "u1"),
+    ("alive", "B", "u1"), ("events", "H", "=u2"),
+]
+COLUMN_TYPES = {name: (code, dtype) for name, code, dtype in COLUMNS}
+COLUMN_MAX = {name: (1 << 8 * array(code).itemsize) - 1 for name, code, _ in COLUMNS} # All columns are unsigned
+CHUNK_ROWS = 1 << 23 # Rows scanned per step of a query, keeps memory flat whatever the archive size
+DENSE_GROUPS_MAX = 1 << 24 # Above this many possible groups a chunk is grouped with np.unique instead of np.bincount
+OPERATORS = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge, "==": operator.eq, "!=": operator.ne}
+
+for _name, _code, _dtype in COLUMNS: # The files are written with array and read with numpy, sizes must agree
+    assert array(_code).itemsize == int(_dtype[-1]), f"array typecode {_code!r} has an unexpected size on this platform"
+
+
+class StatArchive:
+    """Append-only daily snapshots of every pet, stored column by column."""
+
+    def __init__(self, directory=ARCHIVE_DIR, timeout=None):
+        self.directory = directory
+        self.timeout = timeout # Lock timeout for register/flush, raises SaveLockTimeout (an OSError). None blocks
+        self.pending = {name: array(code) for name, code, _ in COLUMNS}
+        self.known = {} # pet_id -> (name, species) already checked against the registry
+        os.makedirs(directory, exist_ok=True)
+
+    def column_path(self, name):
+        return os.path.join(self.directory, f"{name}.bin")
+
+    # --- Registry ---
+    def _registry_path(self):
+        return os.path.join(self.directory, REGISTRY_FILE)
+
+    def load_registry(self):
+        path = self._registry_path()
+        if not os.path.exists(path): return {"next_id": 1, "pets": {}}
+        with locked(path, exclusive=False):
+            with open(path, "r", encoding="utf-8") as f: return json.load(f)
+
+    def register(self, *pets):
+        """Gives each pet a pet_id that is unique within this archive, unless the registry already has it under that id.
+
+        Ids this archive never issued (a save moved from another machine, a deleted pets.json) are replaced."""
+        new_pets = [pet for pet in pets if self.known.get(pet.pet_id) != (pet.name, pet.species)]
+        if not new_pets: return
+        path = self._registry_path()
+        with locked(path, exclusive=True, timeout=self.timeout):
+            registry = {"next_id": 1, "pets": {}}
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f: registry = json.load(f)
+            self.known = {int(k): (p["name"], p["species"]) for k, p in registry["pets"].items()}
+            new_pets = [pet for pet in new_pets if self.known.get(pet.pet_id) != (pet.name, pet.species)]
+            if not new_pets: return
+            for pet in new_pets:
+                pet.pet_id = registry["next_id"]
+                registry["next_id"] += 1
+                registry["pets"][str(pet.pet_id)] = {"name": pet.name, "species": pet.species}
+                self.known[pet.pet_id] = (pet.name, pet.species)
+            with open(path + ".tmp", "w", encoding="utf-8") as f: json.dump(registry, f, ensure_ascii=False)
+            os.replace(path + ".tmp", path)
+
+    # --- Writing ---
+    def append(self, pet, day, week, events=0):
+        """Buffers one day's snapshot of `pet`. Call flush() to write buffered rows."""
+        self.register(pet)
+        row = (pet.pet_id, day, week, pet.hunger, pet.happiness, pet.health, pet.stamina, int(pet.alive), events)
+        try: # Convert the whole row first, a failure halfway through would leave the columns different lengths
+            row = [min(max(int(value), 0), COLUMN_MAX[name]) for (name, _, _), value in zip(COLUMNS, row)]
+        except TypeError as e:
+            raise ValueError(f"Cannot archive {pet.name}: {e}") from e
+        for (name, _, _), value in zip(COLUMNS, row): self.pending[name].append(value)
+
+    def flush(self):
+        if not self.pending["pet_id"]: return 0
+        rows = len(self.pending["pet_id"])
+        with locked(self.column_path("pet_id"), exclusive=True, timeout=self.timeout): # One writer at a time keeps the columns the same length
+            sizes = {name: os.path.getsize(self.column_path(name)) if os.path.exists(self.column_path(name)) else 0
+                     for name, _, _ in COLUMNS}
+            try:
+                for name, _, _ in COLUMNS:
+                    with open(self.column_path(name), "ab") as f: self.pending[name].tofile(f)
+            except OSError: # Undo the columns already written, so a retry doesn't append them twice
+                for name, size in sizes.items():
+                    if os.path.exists(self.column_path(name)): os.truncate(self.column_path(name), size)
+                raise
+            for name, code, _ in COLUMNS: self.pending[name] = array(code)
+        return rows
+
+    def row_count(self):
+        sizes = [os.path.getsize(self.column_path(n)) // array(c).itemsize if os.path.exists(self.column_path(n)) else 0
+                 for n, c, _ in COLUMNS]
+        return min(sizes) # A write interrupted halfway leaves some columns longer, ignore the extra rows
+
+    def query(self):
+        return Query(self)
+
+
+class Query:
+    """Filter/group-by over the archive. Only the columns a query mentions are memory-mapped and scanned.
+
+    archive.query().where("health", "<", 30).group_by("species", "week").mean("health")
+    """
+
+    def __init__(self, archive):
+        if not NUMPY_AVAILABLE: raise RuntimeError("Archive queries need numpy: pip install numpy")
+        self.archive = archive
+        self.filters = [] # (column, op, value)
+        self.event_filters = [] # (bit, wanted)
+        self.groups = []
+
+    def where(self, column, op, value):
+        if op not in OPERATORS: raise ValueError(f"Unknown operator {op!r}, use one of {', '.join(OPERATORS)}.")
+        if column not in COLUMN_TYPES and column != "species": raise ValueError(f"Unknown column {column!r}.")
+        self.filters.append((column, op, value)); return self
+
+    def has_event(self, key, wanted=True):
+        from virtual_pet import EVENT_KEYS # Imported lazily, virtual_pet imports this module
+        self.event_filters.append((EVENT_KEYS.index(key), wanted)); return self
+
+    def group_by(self, *columns):
+        for column in columns:
+            if column not in COLUMN_TYPES and column != "species": raise ValueError(f"Unknown column {column!r}.")
+        self.groups = list(columns); return self
+
+    # --- Aggregations ---
+    def count(self):
+        return self._run(None, lambda s, c: c)
+
+    def sum(self, column):
+        return self._run(column, lambda s, c: s)
+
+    def mean(self, column):
+        return self._run(column, lambda s, c: s / c if c else None)
+
+    def event_rate(self, key):
+        """Share of matching rows in which event `key` fired."""
+        from virtual_pet import EVENT_KEYS
+        return self._run(("events", EVENT_KEYS.index(key)), lambda s, c: s / c if c else None)
+
+    # --- Execution ---
+    def _species_lookup(self):
+        """pet_id -> species code. Id 0, gaps and ids past the registry map to UNKNOWN_SPECIES, the last code."""
+        registry = self.archive.load_registry()
+        names = sorted({p["species"] for p in registry["pets"].values()}) + [UNKNOWN_SPECIES]
+        codes = {name: i for i, name in enumerate(names)}
+        size = max([registry["next_id"]] + [int(pet_id) + 1 for pet_id in registry["pets"]]) + 1
+        lookup = np.full(size, codes[UNKNOWN_SPECIES], dtype=np.uint16) # The last slot catches every id past the end
+        for pet_id, p in registry["pets"].items(): lookup[int(pet_id)] = codes[p["species"]]
+        return names, codes, lookup
+
+    def _run(self, value, finish):
+        needed = {c for c, _, _ in self.filters} | set(self.groups)
+        if self.event_filters: needed.add("events")
+        value_column, value_bit = (value, None) if not isinstance(value, tuple) else value
+        if value_column: needed.add(value_column)
+        species_lookup = None
+        if "species" in needed:
+            needed.discard("species"); needed.add("pet_id")
+            species_names, species_codes, species_lookup = self._species_lookup()
+        rows = self.archive.row_count()
+        maps = {c: np.memmap(self.archive.column_path(c), dtype=COLUMN_TYPES[c][1], mode="r", shape=(rows,))
+                for c in needed} if rows else {}
+
+        totals = {} # group tuple -> [sum, count]
+        for start in range(0, rows, CHUNK_ROWS):
+            stop = min(rows, start + CHUNK_ROWS)
+            chunk = {c: m[start:stop] for c, m in maps.items()}
+            if "pet_id" in chunk and species_lookup is not None:
+                chunk["species"] = species_lookup[np.minimum(chunk["pet_id"], len(species_lookup) - 1)]
+            mask = np.ones(stop - start, dtype=bool)
+            for column, op, target in self.filters:
+                if column == "species": target = species_codes.get(target, -1)
+                mask &= OPERATORS[op](chunk[column], target)
+            for bit, wanted in self.event_filters:
+                mask &= ((chunk["events"] >> bit) & 1).astype(bool) == wanted
+            if value_column is None: values = None
+            elif value_bit is None: values = chunk[value_column][mask].astype(np.float64)
+            else: values = ((chunk[value_column][mask] >> value_bit) & 1).astype(np.float64)
+            self._accumulate(totals, [chunk[g][mask] for g in self.groups], values, int(mask.sum()))
+
+        if "species" in self.groups:
+            i = self.groups.index("species")
+            totals = {k[:i] + (species_names[k[i]],) + k[i + 1:]: v for k, v in totals.items()}
+        results = {k: finish(s, c) for k, (s, c) in sorted(totals.items())}
+        if not self.groups: return results.get((), finish(0, 0))
+        return results
+
+    def _accumulate(self, totals, keys, values, matched):
+        if not matched: return
+        if not keys:
+            entry = totals.setdefault((), [0.0, 0])
+            entry[0] += float(values.sum()) if values is not None else 0.0; entry[1] += matched
+            return
+        dims = [int(k.max()) + 1 for k in keys]
+        flat = np.ravel_multi_index([k.astype(np.int64) for k in keys], dims) if len(keys) > 1 else keys[0].astype(np.int64)
+        if prod(dims) <= DENSE_GROUPS_MAX:
+            counts = np.bincount(flat, minlength=prod(dims))
+            sums = np.bincount(flat, weights=values, minlength=prod(dims)) if values is not None else counts * 0.0
+            present = np.nonzero(counts)[0]
+            groups = zip(*np.unravel_index(present, dims)) if len(keys) > 1 else ((g,) for g in present)
+            counts, sums = counts[present], sums[present]
+        else:
+            uniques, inverse = np.unique(flat, return_inverse=True)
+            counts = np.bincount(inverse)
+            sums = np.bincount(inverse, weights=values) if values is not None else counts * 0.0
+            groups = zip(*np.unravel_index(uniques, dims)) if len(keys) > 1 else ((g,) for g in uniques)
+        for group, c, s in zip(groups, counts.tolist(), sums.tolist()):
+            entry = totals.setdefault(tuple(int(g) for g in group), [0.0, 0])
+            entry[0] += s; entry[1] += c
+
+
+# --- Benchmark ---
+def generate_synthetic(archive, rows, pets=100000, seed=0):
+    """Fills an archive with random rows, written straight to the column files, for benchmarking queries."""
+    if not NUMPY_AVAILABLE: raise RuntimeError("Generating synthetic data needs numpy: pip install numpy")
+    from virtual_pet import Pet
+    rng = np.random.default_rng(seed)
+    species = ["Dog", "Cat", "Bird"]
+    archive.register(*(Pet(f"Pet{i}", species[i % 3], "Male") for i in range(pets)))
+    for start in range(0, rows, CHUNK_ROWS):
+        n = min(CHUNK_ROWS, rows - start)
+        data = {
+            "pet_id": rng.integers(1, pets + 1, n), "day": rng.integers(1, 8, n), "week": rng.integers(1, 60, n),
+            "hunger": rng.integers(0, 101, n), "happiness": rng.integers(0, 101, n), "health": rng.integers(0, 101, n),
+            "stamina": rng.integers(0, 31, n), "alive": rng.random(n) < 0.95, "events": rng.integers(0, 1 << 11, n),
+        }
+        for name, _, dtype in COLUMNS:
+            with open(archive.column_path(name), "ab") as f: data[name].astype(dtype).tofile(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the daily pet stat archive.")
+    parser.add_argument("--dir", default=ARCHIVE_DIR)
+    parser.add_argument("--generate", type=int, default=0, help="Append this many synthetic rows first (benchmarking).")
+    args = parser.parse_args()
+    archive = StatArchive(args.dir)
+    if args.generate:
+        start = time.perf_counter()
+        generate_synthetic(archive, args.generate)
+        print(f"Generated {args.generate:,} rows in {time.perf_counter() - start:.1f} s")
+    print(f"{archive.row_count():,} rows in {args.dir}")
+
+    start = time.perf_counter()
+    by_species_week = archive.query().group_by("species", "week").mean("health")
+    print(f"\nAverage health by species and week ({time.perf_counter() - start:.2f} s):")
+    for (species, week), health in list(by_species_week.items())[:20]: print(f"  {species:<6} week {week:>3}: {health:6.2f}")
+    if len(by_species_week) > 20: print(f"  ... {len(by_species_week) - 20} more groups")
+
+    start = time.perf_counter()
+    rate = archive.query().where("health", "<", 30).event_rate("chocolate")
+    print(f"\nChocolate event rate on days with health < 30: {rate if rate is None else f'{rate:.4%}'} "
+          f"({time.perf_counter() - start:.2f} s)")
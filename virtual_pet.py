@@ -1,11 +1,16 @@
+import argparse
 import json
 import os
 import random
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 import tkinter as tk
 from tkinter import ttk, simpledialog, messagebox, scrolledtext
 from tkinter import font as tkFont
 
+from save_lock import locked, remove_lock, SaveWatcher, SaveConflictError, SaveLockTimeout, LOCK_STATS
+from stat_archive import StatArchive, ARCHIVE_DIR
+
 
 # Attempt to import Pillow (PIL)
 try:
@@ -22,10 +27,16 @@ except AttributeError:
     JSONDecodeError = ValueError # Fallback for older Python versions
 
 PET_FILE = "my_pet.json"
+PETS_DIR = "pets" # Extra save files listed by the pet dashboard
 ASCII_ART_FILE = "pet_ascii_art.json"
 TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
 DAY_DURATION = 24 * 60 * 60
 DAYS_PER_WEEK = 7
+CLOCK_TICK_MS = 100 # How often the GUI checks whether a game day passed, when not using the real clock
+SAVE_POLL_MS = 1000 # How often the app checks the save file for changes made by other programs
+SAVE_LOCK_TIMEOUT = 1.0 # Seconds the GUI waits for a save lock before giving up
+LOG_MAX_LINES = 1000 # Older log lines are dropped so long sessions don't grow the widget forever
+MAX_CATCH_UP_DAYS = 365 # Longest absence simulated when a save is loaded
 
 # --- Pet Class (Unchanged) ---
 class Pet:
@@ -40,6 +51,7 @@ class Pet:
         self.alive = True
         self.neutered = neutered
         self.stamina = 20
+        self.pet_id = None # Assigned by the stat archive
 
     def feed(self):
         if not self.alive:
@@ -106,7 +118,8 @@ class Pet:
         return {
             "name": self.name, "species": self.species, "gender": self.gender,
             "hunger": self.hunger, "happiness": self.happiness, "health": self.health,
-            "age": self.age, "alive": self.alive, "neutered": self.neutered, "stamina": self.stamina
+            "age": self.age, "alive": self.alive, "neutered": self.neutered, "stamina": self.stamina,
+            "pet_id": self.pet_id
         }
 
     @classmethod
@@ -121,38 +134,125 @@ class Pet:
         pet.age = data["age"]
         pet.alive = data["alive"]
         pet.stamina = min(30, max(0, data.get("stamina", 20)))
+        pet.pet_id = data.get("pet_id")
         return pet
 
+# --- Clocks ---
+# Everything that needs the current time goes through get_now(), so tests and soak runs can swap the clock.
+class RealClock:
+    def now(self):
+        return datetime.now()
+
+class FixedClock:
+    """Only moves when told to."""
+    def __init__(self, moment=None):
+        self.moment = moment or datetime.now().replace(microsecond=0)
+
+    def now(self):
+        return self.moment
+
+    def advance(self, days=0, seconds=0):
+        self.moment += timedelta(seconds=days * DAY_DURATION + seconds)
+        return self.moment
+
+class ScaledClock:
+    """Runs `seconds_per_day` real seconds per game day, e.g. 0.1 for 1 day = 100 ms."""
+    def __init__(self, seconds_per_day, start=None):
+        if not 0 < seconds_per_day < float("inf"): # Zero would divide by zero, negative runs time backwards
+            raise ValueError(f"Seconds per day must be a positive number, got {seconds_per_day}.")
+        self.scale = DAY_DURATION / seconds_per_day
+        self.start = start or datetime.now()
+        self.started_at = time.monotonic()
+
+    def now(self):
+        return self.start + timedelta(seconds=(time.monotonic() - self.started_at) * self.scale)
+
+    def anchor(self, moment):
+        """Restarts the clock at `moment`, e.g. a save's last_time, so game time carries on from there."""
+        self.start = moment
+        self.started_at = time.monotonic()
+
+_clock = RealClock()
+
+def set_clock(clock):
+    global _clock
+    _clock = clock
+
+def get_clock():
+    return _clock
+
+def parse_clock(spec):
+    """'real', 'fixed', 'fixed:YYYY-MM-DD HH:MM:SS' or 'scaled:<seconds per day>'."""
+    kind, _, arg = spec.partition(":")
+    if kind == "real": return RealClock()
+    if kind == "fixed": return FixedClock(datetime.strptime(arg, TIME_FORMAT) if arg else None)
+    if kind == "scaled": return ScaledClock(float(arg or 0.1))
+    raise ValueError(f"Unknown clock '{spec}'. Use real, fixed[:{TIME_FORMAT}] or scaled:<seconds per day>.")
+
 # --- Helper Functions ---
 def get_now():
-    return datetime.now()
-
-def save_pet_data(pet_obj, current_day, current_week, last_time_obj):
-    data = {
-        "pet": pet_obj.to_dict(), "current_day": current_day,
-        "current_week": current_week, "last_time": last_time_obj.strftime(TIME_FORMAT)
-    }
-    with open(PET_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-def load_pet_data():
-    if os.path.exists(PET_FILE):
+    return _clock.now()
+
+def _read_save(pet_file):
+    with open(pet_file, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _disk_version(pet_file):
+    """Version of the save on disk, 0 if it is missing or unreadable. Call with the save's lock held."""
+    if not os.path.exists(pet_file): return 0
+    try: return _read_save(pet_file).get("version", 0)
+    except (JSONDecodeError, OSError, AttributeError): return 0
+
+def save_pet_data(pet_obj, current_day, current_week, last_time_obj, pet_file=PET_FILE, expected_version=None, timeout=None):
+    """Writes the save and returns its new version. Raises SaveConflictError if `expected_version` is given and the file moved on."""
+    with locked(pet_file, exclusive=True, timeout=timeout):
+        disk_version = _disk_version(pet_file)
+        if expected_version is not None and disk_version != expected_version:
+            raise SaveConflictError(pet_file, expected_version, disk_version)
+        data = {
+            "pet": pet_obj.to_dict(), "current_day": current_day,
+            "current_week": current_week, "last_time": last_time_obj.strftime(TIME_FORMAT),
+            "version": disk_version + 1
+        }
+        tmp_file = pet_file + ".tmp" # Write then rename, so readers never see a half-written save
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, pet_file)
+    return data["version"]
+
+def read_pet_data(pet_file=PET_FILE, timeout=None):
+    """Reads a save without touching it. Returns (pet, day, week, last_time, version), raises if the file is unreadable."""
+    with locked(pet_file, exclusive=False, timeout=timeout):
+        data = _read_save(pet_file)
+    pet = Pet.from_dict(data["pet"])
+    current_day = data.get("current_day", 1)
+    current_week = data.get("current_week", 1)
+    last_time_str = data.get("last_time", get_now().strftime(TIME_FORMAT))
+    last_time = datetime.strptime(last_time_str, TIME_FORMAT)
+    return pet, current_day, current_week, last_time, data.get("version", 0)
+
+def load_pet_data(pet_file=PET_FILE, with_version=False, timeout=None):
+    result = (None, 1, 1, get_now(), 0)
+    if os.path.exists(pet_file):
         try:
-            with open(PET_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            pet = Pet.from_dict(data["pet"])
-            current_day = data.get("current_day", 1)
-            current_week = data.get("current_week", 1)
-            last_time_str = data.get("last_time", get_now().strftime(TIME_FORMAT))
-            last_time = datetime.strptime(last_time_str, TIME_FORMAT)
-            return pet, current_day, current_week, last_time
+            result = read_pet_data(pet_file, timeout)
         except (JSONDecodeError, KeyError, FileNotFoundError) as e: # Use the new JSONDecodeError variable
             print(f"Error loading pet file: {e}. Starting fresh.")
-            if os.path.exists(PET_FILE):
-                try: os.remove(PET_FILE)
-                except OSError: pass
-            return None, 1, 1, get_now()
-    return None, 1, 1, get_now()
+            try: delete_save(pet_file, timeout=timeout)
+            except (OSError, SaveLockTimeout): pass
+    return result if with_version else result[:4]
+
+def delete_save(pet_file=PET_FILE, timeout=None, expected_version=None):
+    """Removes a save under its lock. Returns False if there was nothing to remove.
+    Raises SaveConflictError if `expected_version` is given and the file moved on."""
+    with locked(pet_file, exclusive=True, timeout=timeout):
+        if not os.path.exists(pet_file): remove_lock(pet_file); return False
+        disk_version = _disk_version(pet_file)
+        if expected_version is not None and disk_version != expected_version:
+            raise SaveConflictError(pet_file, expected_version, disk_version)
+        os.remove(pet_file)
+        remove_lock(pet_file)
+    return True
 
 def load_ascii_art():
     if os.path.exists(ASCII_ART_FILE):
@@ -165,11 +265,13 @@ def load_ascii_art():
     return {"_default_": {"idle": ["ASCII Art", "File Missing"]}}
 
 
-def advance_days_on_load(pet_obj, last_time_obj, current_day_val, current_week_val, app_ref):
+def advance_days_on_load(pet_obj, last_time_obj, current_day_val, current_week_val, app_ref, archive=None):
     now = get_now()
     elapsed = (now - last_time_obj).total_seconds()
+    if elapsed < 0: # Saved under a faster clock, or the system clock moved back
+        app_ref.log_message("Save time is ahead of the current time, continuing from now.")
+        return pet_obj, current_day_val, current_week_val, now
     days_passed = int(elapsed // DAY_DURATION)
-    MAX_CATCH_UP_DAYS = 365
     if days_passed > MAX_CATCH_UP_DAYS:
         app_ref.log_message(f"Time since last play is very long. Capping catch-up to {MAX_CATCH_UP_DAYS} days.")
         days_passed = MAX_CATCH_UP_DAYS
@@ -180,16 +282,24 @@ def advance_days_on_load(pet_obj, last_time_obj, current_day_val, current_week_v
             if not pet_obj.alive:
                 app_ref.log_message(f"{pet_obj.name} did not survive the time away.")
                 break
-            for msg in pet_obj.grow(): app_ref.log_message(msg)
-            for msg in trigger_event_auto(pet_obj, new_current_day, app_ref): app_ref.log_message(msg)
-            if random.random() < 0.1:
+            day_messages = pet_obj.grow()
+            day_messages += trigger_event_auto(pet_obj, new_current_day, app_ref)
+            if pet_obj.alive and random.random() < 0.1: # grow() may have just killed the pet
                 pet_obj.stamina = min(30, pet_obj.stamina + 10)
-                app_ref.log_message(f"\n【Lucky Event】{pet_obj.name} seemed energetic, stamina +10!")
+                day_messages.append(f"\n【Lucky Event】{pet_obj.name} seemed energetic, stamina +10!")
+            for msg in day_messages: app_ref.log_message(msg)
+            if archive:
+                try: archive.append(pet_obj, new_current_day, new_current_week, event_mask(day_messages))
+                except (OSError, ValueError, KeyError) as e: # Broken pets.json, keep playing without the history
+                    app_ref.log_message(f"Could not archive stats while you were away: {e}"); archive = None
             new_current_day += 1
             if new_current_day > DAYS_PER_WEEK:
                 new_current_week += 1
                 new_current_day = 1
                 app_ref.log_message(f"A new week (Week {new_current_week}) started for {pet_obj.name}.")
+        if archive:
+            try: archive.flush()
+            except OSError as e: app_ref.log_message(f"Could not archive stats while you were away: {e}")
         app_ref.log_message("Day advancement complete.")
     return pet_obj, new_current_day, new_current_week, now
 
@@ -201,30 +311,31 @@ def trigger_event_auto(pet, current_day, app):
         pet.happiness = max(0, pet.happiness - 10)
     if random.random() < 0.1:
         messages.append(f"\n【Event】{pet.name} made a new friend outside today! Mood improved!.")
-        pet.happiness = min(0, pet.happiness + 10)
+        pet.happiness = min(100, pet.happiness + 10)
     if random.random() < 0.1:
         messages.append(f"\n【Event】{pet.name} rolled around in the mud today. Happiness up, health down.")
-        pet.happiness = min(0, pet.happiness + 10); pet.health = max(0, pet.health - 10)
+        pet.happiness = min(100, pet.happiness + 10); pet.health = max(0, pet.health - 10)
     if random.random() < 0.1:
         messages.append(f"\n【Event】{pet.name} was fed a small piece of chocolate by a kind youth today! Mood improved, health decreased.")
-        pet.happiness = min(0, pet.happiness + 10);
+        pet.happiness = min(100, pet.happiness + 10);
         pet.health = max(0, pet.health - 10)
     if random.random() < 0.1:
         messages.append(f"\n【Event】{pet.name} found a tasty snack at a food stall today! Mood and hunger both improved!")
-        pet.happiness = min(0, pet.happiness + 10);
-        pet.hunger = min(0, pet.hunger + 10)
+        pet.happiness = min(100, pet.happiness + 10);
+        pet.hunger = min(100, pet.hunger + 10)
     if random.random() < 0.005:
         messages.append(f"\n【Event】{pet.name} died today after accidentally ingesting pesticide.")
         pet.health = 0
         pet.alive = False
     return messages
 
-def trigger_event_interactive(pet, current_day, app):
+def trigger_event_interactive(pet, current_day, app, ask=None):
     if not pet.alive: return False
+    ask = ask or messagebox.askyesno # Injectable so the events can run without a GUI
     event_happened = False
     if pet.happiness < 30 and random.random() < 0.6:
         app.log_message(f"\n【Sudden Event】Your {pet.name} seemed very depressed. Health slightly affected.")
-        if messagebox.askyesno("Sudden Event", "Play with pet? (Yes)\nIgnore? (No)"):
+        if ask("Sudden Event", "Play with pet? (Yes)\nIgnore? (No)"):
             pet.happiness = min(100, pet.happiness + 30);
             pet.health = min(100, pet.health + 15)
             app.log_message("Mood and health improved!")
@@ -234,7 +345,7 @@ def trigger_event_interactive(pet, current_day, app):
         event_happened = True
     elif pet.happiness > 70 and random.random() < 0.3:
         app.log_message(f"\n【Sudden Event】Your {pet.name} seemed quite happy and playful on its own.")
-        if messagebox.askyesno("Sudden Event", "Play with pet? (Yes)\nIgnore? (No)"):
+        if ask("Sudden Event", "Play with pet? (Yes)\nIgnore? (No)"):
             pet.happiness = min(100, pet.happiness + 5); pet.health = min(100, pet.health + 5)
             app.log_message("Mood and health improved!")
         else:
@@ -242,13 +353,13 @@ def trigger_event_interactive(pet, current_day, app):
         event_happened = True
     elif random.random() < 0.2:
         app.log_message(f"\n【Sudden Event】{pet.name} seems bored with the usual food and is curious about new things.")
-        if messagebox.askyesno("Sudden Event", "Try some new food? (Yes)\nKeep original food? (No)"):
+        if ask("Sudden Event", "Try some new food? (Yes)\nKeep original food? (No)"):
             if random.random() < 0.5:
                 pet.hunger = min(100, pet.hunger + 5)
                 app.log_message("Found a tasty morsel! Hunger slightly increased.")
             else:
                 pet.happiness = max(0, pet.happiness - 5)
-                app.log_message("New food is not tasty. Happiness slightly increased.")
+                app.log_message("New food is not tasty. Happiness slightly decreased.")
         else:
             pet.happiness = max(0, pet.happiness - 30); pet.hunger = max(0, pet.hunger - 20)
             app.log_message("No eating!!! Mood greatly decreased.")
@@ -281,6 +392,38 @@ def weekend_option_event(pet, app): # Unchanged
         pet.hunger = 100; pet.happiness = 100; pet.health = 100; pet.stamina = 30
         msg += "All stats boosted to maximum!"
     app.log_message(msg)
+    return msg
+
+# --- Event Classification ---
+# (event key, phrase that only appears in that branch's message). Used by the stats tools and the daily archive.
+EVENT_PATTERNS = [
+    ("estrus", "seemed restless (Estrus)"),
+    ("new_friend", "made a new friend outside"),
+    ("mud", "rolled around in the mud"),
+    ("chocolate", "small piece of chocolate"),
+    ("snack", "found a tasty snack"),
+    ("pesticide", "accidentally ingesting pesticide"),
+    ("lucky_stamina", "【Lucky Event】"),
+    ("weekend_decrease", "randomly decreased by 5"),
+    ("weekend_increase", "randomly increased by 5"),
+    ("weekend_boost", "was boosted to maximum"),
+    ("weekend_all_max", "All stats boosted to maximum"),
+]
+EVENT_KEYS = [key for key, _ in EVENT_PATTERNS]
+
+def classify_event(msg):
+    """Returns the EVENT_KEYS entry for a log message, or None if it is not an event."""
+    for key, phrase in EVENT_PATTERNS:
+        if phrase in msg: return key
+    return None
+
+def event_mask(messages):
+    """Bitmask of the events in `messages`, bit i set for EVENT_KEYS[i]."""
+    mask = 0
+    for msg in messages:
+        key = classify_event(msg)
+        if key: mask |= 1 << EVENT_KEYS.index(key)
+    return mask
 
 # --- GUI Application ---
 class PetApp:
@@ -289,11 +432,19 @@ class PetApp:
         self.root.title("Virtual Pet Paradise ASCII")
         self.root.geometry("800x900") # Adjusted for ASCII art
         self.pet = None
+        self.pet_file = PET_FILE
+        self.save_version = None # Version of the save we last read or wrote, None until the first one
+        self.save_watcher = SaveWatcher(self.pet_file)
         self.current_day = 1
         self.current_week = 1
         self.last_interaction_time = get_now()
         self.rested_today = False
+        self.day_events = [] # Messages from the start of the current day (weekend event), archived with its row
         self.pet_icons = {} # To store PhotoImage objects
+        try: self.archive = StatArchive(ARCHIVE_DIR, timeout=SAVE_LOCK_TIMEOUT) # Daily stat history for analytics
+        except OSError as e: # The log widget doesn't exist yet
+            print(f"Could not open the stat archive ({e}). Daily stats will not be recorded.")
+            self.archive = None
 
         self.pet_ascii_art_data = load_ascii_art() # Load ASCII art
 
@@ -407,11 +558,15 @@ class PetApp:
         # --- Menu ---
         menubar = tk.Menu(self.root, font=self.font_main); filemenu = tk.Menu(menubar, tearoff=0, font=self.font_main)
         filemenu.add_command(label="New Pet", command=self.start_new_game_prompt); filemenu.add_command(label="Clear Save Data", command=self.clear_save_data_prompt)
+        filemenu.add_command(label="Pet Dashboard", command=self.open_dashboard)
         filemenu.add_separator(); filemenu.add_command(label="Exit", command=self.quit_game)
         menubar.add_cascade(label="Game", menu=filemenu); self.root.config(menu=menubar)
         self.root.protocol("WM_DELETE_WINDOW", self.quit_game)
         self.load_game()
         self.update_pet_ascii_art("idle") # Initial ASCII art
+        self.root.after(SAVE_POLL_MS, self.poll_save_file)
+        self.in_clock_tick = False
+        if not isinstance(get_clock(), RealClock): self.root.after(CLOCK_TICK_MS, self.clock_tick)
 
     def _load_icons(self):
         if not PIL_AVAILABLE: return
@@ -460,6 +615,8 @@ class PetApp:
         if not hasattr(self, 'message_log') or not self.message_log.winfo_exists(): return
         self.message_log.config(state=tk.NORMAL)
         self.message_log.insert(tk.END, msg + "\n")
+        excess = int(self.message_log.index("end-1c").split(".")[0]) - 1 - LOG_MAX_LINES
+        if excess > 0: self.message_log.delete("1.0", f"{excess + 1}.0")
         self.message_log.see(tk.END)
         self.message_log.config(state=tk.DISABLED)
         print(msg)
@@ -497,26 +654,128 @@ class PetApp:
         self.root.update_idletasks() # Ensure UI updates promptly
 
     def save_game_state(self):
-        if self.pet: save_pet_data(self.pet, self.current_day, self.current_week, self.last_interaction_time)
+        if not self.pet: return
+        slow_locks = LOCK_STATS.slow
+        try:
+            self.save_version = save_pet_data(self.pet, self.current_day, self.current_week, self.last_interaction_time,
+                                              self.pet_file, self.save_version, SAVE_LOCK_TIMEOUT)
+        except SaveConflictError as e:
+            self.log_message(f"\nSave file was changed by another program (version {e.disk_version}). Loading its changes instead of overwriting them.")
+            self.poll_save_file(reschedule=False, force=True)
+            return
+        except SaveLockTimeout:
+            self.log_message("Save file is busy, progress will be saved on the next action.")
+            return
+        if LOCK_STATS.slow > slow_locks: # Usually a slow disk or another program reading the save
+            self.log_message(f"Saving was slow, the save file stayed locked for {LOCK_STATS.last_slow[1] * 1000:.0f} ms.")
+        self.save_watcher.sync()
+
+    def poll_save_file(self, reschedule=True, force=False):
+        if not hasattr(self, 'root') or not self.root.winfo_exists(): return
+        try:
+            if self.save_watcher.changed() or force:
+                if not self.save_watcher.exists():
+                    if self.save_version is not None:
+                        self.log_message("\nSave file was removed by another program. It will be recreated on the next save.")
+                        self.save_version = None
+                else:
+                    loaded = read_pet_data(self.pet_file, timeout=0)
+                    if loaded[4] != self.save_version or self.differs_from_save(*loaded[:4]): # Hand edits keep the version
+                        self.apply_external_save(*loaded)
+        except SaveLockTimeout:
+            self.save_watcher.signature = None # Another program holds the lock, look again next poll
+        except (OSError, ValueError, KeyError): # Unreadable or half-edited save, never delete it from here
+            self.save_watcher.signature = None
+        if reschedule: self.root.after(SAVE_POLL_MS, self.poll_save_file)
+
+    def differs_from_save(self, pet, current_day, current_week, last_time):
+        if not self.pet or pet.to_dict() != self.pet.to_dict(): return True
+        if (current_day, current_week) != (self.current_day, self.current_week): return True
+        return last_time.strftime(TIME_FORMAT) != self.last_interaction_time.strftime(TIME_FORMAT) # Saves keep whole seconds
+
+    def apply_external_save(self, pet, current_day, current_week, last_time, version):
+        """Copies only the fields that changed on disk into the running game."""
+        changes = []
+        if self.pet and self.pet.name == pet.name and self.pet.species == pet.species:
+            for key, value in pet.to_dict().items():
+                if getattr(self.pet, key) != value:
+                    changes.append(f"{key} {getattr(self.pet, key)} -> {value}")
+                    setattr(self.pet, key, value)
+        else:
+            self.pet = pet; changes.append(f"pet is now {pet.name}")
+        if (current_day, current_week) != (self.current_day, self.current_week):
+            changes.append(f"Week {current_week}, Day {current_day}")
+            self.current_day, self.current_week = current_day, current_week
+        self.last_interaction_time = last_time
+        self.save_version = version
+        self.save_watcher.sync()
+        self.log_message(f"\nSave updated by another program (version {version}): " + (", ".join(changes) or "no changes") + ".")
+        self.update_pet_ascii_art("idle")
+        self.update_display()
 
-    def load_game(self):
-        self.pet, self.current_day, self.current_week, self.last_interaction_time = load_pet_data()
+    def load_game(self, loaded=None):
+        """Starts the game from `loaded` (a read_pet_data result) or, at startup, from whatever self.pet_file holds."""
+        if loaded is None:
+            try: loaded = load_pet_data(self.pet_file, with_version=True, timeout=SAVE_LOCK_TIMEOUT)
+            except SaveLockTimeout: # Another program is writing it, never block the window waiting
+                self.log_message("Save file is busy, trying again shortly...")
+                self.root.after(SAVE_POLL_MS, self.load_game); return
+            except OSError as e: # Unreadable (e.g. permissions), leave it alone
+                self.log_message(f"Could not read save file {self.pet_file}: {e}"); self.update_display(); return
+        self.pet, self.current_day, self.current_week, self.last_interaction_time, version = loaded
+        self.save_version = version if self.pet else None
+        self.save_watcher = SaveWatcher(self.pet_file)
         if self.pet:
+            if isinstance(get_clock(), ScaledClock): get_clock().anchor(self.last_interaction_time)
             self.log_message(f"Welcome back! Loading pet {self.pet.name}.")
+            self.register_pet()
             self.pet, self.current_day, self.current_week, self.last_interaction_time = \
-                advance_days_on_load(self.pet, self.last_interaction_time, self.current_day, self.current_week, self)
-            self.rested_today = False
+                advance_days_on_load(self.pet, self.last_interaction_time, self.current_day, self.current_week, self, self.archive)
+            self.rested_today = False; self.day_events = []
             if not self.pet.alive: self.handle_pet_death(manual_next_day=False)
             else:
                 self.update_pet_ascii_art("idle")
                 if self.current_day >= 5: # Example: weekend on day 5, 6, or 7
                     self.log_message(f"It's day {self.current_day}, checking for weekend event...")
-                    weekend_option_event(self.pet, self)
+                    self.day_events.append(weekend_option_event(self.pet, self))
         else:
             self.log_message("No saved pet found, please create a new pet.")
             self.choose_new_pet_dialog() # This will also call update_display and save
         self.update_display() # Ensure display is updated after loading or new pet dialog
 
+    def clock_tick(self): # Lets days pass while the window is open under a fixed or scaled clock
+        if not hasattr(self, 'root') or not self.root.winfo_exists(): return
+        if not self.in_clock_tick and self.pet and self.pet.alive and \
+                (get_now() - self.last_interaction_time).total_seconds() >= DAY_DURATION:
+            self.in_clock_tick = True # Dialogs below run a nested event loop that keeps firing ticks
+            try:
+                self.pet, self.current_day, self.current_week, self.last_interaction_time = \
+                    advance_days_on_load(self.pet, self.last_interaction_time, self.current_day, self.current_week, self, self.archive)
+                self.rested_today = False; self.day_events = []
+                if self.pet.alive:
+                    if self.current_day >= 5: self.day_events.append(weekend_option_event(self.pet, self))
+                    if self.current_day == 6 and not self.pet.neutered and self.pet.age >= (DAYS_PER_WEEK + 6):
+                        self.prompt_neutering()
+                    self.update_pet_ascii_art("idle")
+                self.update_display(); self.save_game_state(); self.check_pet_status()
+            finally:
+                self.in_clock_tick = False
+        self.root.after(CLOCK_TICK_MS, self.clock_tick)
+
+    def open_dashboard(self):
+        from pet_dashboard import PetDashboard # Imported lazily, pet_dashboard imports this module
+        PetDashboard(self)
+
+    def open_pet_file(self, pet_file): # Called by the dashboard when a row is selected
+        if os.path.abspath(pet_file) == os.path.abspath(self.pet_file): return
+        try: loaded = read_pet_data(pet_file, timeout=SAVE_LOCK_TIMEOUT)
+        except (OSError, ValueError, KeyError) as e: # Never delete a save picked from the dashboard
+            self.log_message(f"\nCould not open save file {pet_file}: {e}"); return
+        self.save_game_state()
+        self.pet_file = pet_file
+        self.log_message(f"\nSwitching to save file {pet_file}...")
+        self.load_game(loaded)
+
     def choose_new_pet_dialog(self):
         dialog = tk.Toplevel(self.root)
         dialog.title("Create New Pet"); dialog.geometry("600x400"); dialog.transient(self.root)
@@ -539,8 +798,9 @@ class PetApp:
             if not name: messagebox.showerror("Error", "Pet name cannot be empty!", parent=dialog); return
             if len(name) > 15: messagebox.showerror("Error", "Pet name too long (max 15 char)!", parent=dialog); return
             self.pet = Pet(name, species_var.get(), gender_var.get())
+            self.register_pet()
             self.current_day = 1; self.current_week = 1
-            self.last_interaction_time = get_now(); self.rested_today = False
+            self.last_interaction_time = get_now(); self.rested_today = False; self.day_events = []
             self.log_message(f"You adopted a new {self.pet.species} named {self.pet.name}!")
             self.update_pet_ascii_art("idle")
             dialog.destroy()
@@ -593,24 +853,41 @@ class PetApp:
         if not self.pet or not self.pet.alive:
             self.log_message("Cannot proceed to the next day, no healthy pet available."); return
         self.log_message(f"--- {self.pet.name} enters a new day ---")
+        day_lived, week_lived = self.current_day, self.current_week
         self.pet.stamina = 20; self.rested_today = False
-        for msg in self.pet.grow(): self.log_message(msg)
-        if not self.pet.alive: self.handle_pet_death(); return
+        grow_messages = self.pet.grow()
+        for msg in grow_messages: self.log_message(msg)
+        day_messages = self.day_events + grow_messages; self.day_events = []
+        if not self.pet.alive:
+            self.archive_day(day_lived, week_lived, day_messages); self.handle_pet_death(); return
         self.update_pet_ascii_art("idle")
         trigger_event_interactive(self.pet, self.current_day, self)
         if random.random() < 0.1:
             self.pet.stamina = min(30, self.pet.stamina + 10)
-            self.log_message(f"【Lucky Event】{self.pet.name} is energetic today, stamina +10!")
+            day_messages.append(f"【Lucky Event】{self.pet.name} is energetic today, stamina +10!")
+            self.log_message(day_messages[-1])
         self.current_day += 1
         if self.current_day > DAYS_PER_WEEK:
             self.current_week += 1; self.current_day = 1
             self.log_message(f"\nA new week has begun! It is now Week {self.current_week}.")
         self.last_interaction_time = get_now()
-        if self.current_day >= 5: weekend_option_event(self.pet, self)
+        if self.current_day >= 5: self.day_events.append(weekend_option_event(self.pet, self)) # Belongs to the day it opens
         if self.current_day == 6 and not self.pet.neutered and self.pet.age >= (DAYS_PER_WEEK + 6):
             self.prompt_neutering()
+        self.archive_day(day_lived, week_lived, day_messages)
         self.update_display(); self.save_game_state(); self.check_pet_status()
 
+    def register_pet(self):
+        if not self.archive: return
+        try: self.archive.register(self.pet)
+        except (OSError, ValueError, KeyError) as e: self.log_message(f"Could not add {self.pet.name} to the stat archive: {e}")
+
+    def archive_day(self, day, week, day_messages):
+        if not self.archive: return
+        try:
+            self.archive.append(self.pet, day, week, event_mask(day_messages)); self.archive.flush()
+        except (OSError, ValueError, KeyError) as e: self.log_message(f"Could not archive today's stats: {e}")
+
     def prompt_neutering(self): # Unchanged logic, but added parent to messagebox
         if self.pet and self.pet.alive and not self.pet.neutered:
             self.log_message("\n【Special Tip】Pet is old enough for neutering.")
@@ -638,23 +915,32 @@ class PetApp:
         self.start_new_game_logic()
 
     def start_new_game_logic(self):
+        try:
+            if delete_save(self.pet_file, SAVE_LOCK_TIMEOUT, self.save_version or 0): self.log_message("Old save data cleared.")
+        except SaveConflictError as e:
+            self.log_message(f"\nSave file was changed by another program (version {e.disk_version}). Loading it instead of clearing it.")
+            self.poll_save_file(reschedule=False, force=True)
+            return
+        except (OSError, SaveLockTimeout) as e: self.log_message(f"Could not clear old save: {e}")
         self.pet = None
-        if os.path.exists(PET_FILE):
-            try: os.remove(PET_FILE); self.log_message("Old save data cleared.")
-            except OSError as e: self.log_message(f"Could not clear old save: {e}")
+        self.save_version = None; self.save_watcher.sync()
         self.choose_new_pet_dialog()
 
     def clear_save_data_prompt(self): # Added parent to all messageboxes
         if messagebox.askyesno("Clear Save Data", "Clear ALL save data? Cannot be undone.", parent=self.root):
-            if os.path.exists(PET_FILE):
-                try:
-                    os.remove(PET_FILE); self.log_message("Save file cleared.")
+            try:
+                if delete_save(self.pet_file, SAVE_LOCK_TIMEOUT, self.save_version or 0):
+                    self.log_message("Save file cleared.")
                     self.pet = None; self.current_day = 1; self.current_week = 1
                     self.last_interaction_time = get_now(); self.rested_today = False
+                    self.save_version = None; self.save_watcher.sync()
                     self.update_display()
                     messagebox.showinfo("Save Cleared", "Save data cleared. Start new game from menu.", parent=self.root)
-                except OSError as e: messagebox.showerror("Error", f"Could not clear save: {e}", parent=self.root)
-            else: messagebox.showinfo("Notice", "No save file found.", parent=self.root)
+                else: messagebox.showinfo("Notice", "No save file found.", parent=self.root)
+            except SaveConflictError as e:
+                messagebox.showerror("Error", f"Save file was changed by another program (version {e.disk_version}), it was not cleared.", parent=self.root)
+                self.poll_save_file(reschedule=False, force=True)
+            except (OSError, SaveLockTimeout) as e: messagebox.showerror("Error", f"Could not clear save: {e}", parent=self.root)
 
     def quit_game(self): # Added parent to all messageboxes
         should_destroy = False
@@ -670,6 +956,10 @@ class PetApp:
         if should_destroy: self.root.destroy()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Virtual Pet Paradise ASCII")
+    parser.add_argument("--clock", default="real", help="real, fixed[:YYYY-MM-DD HH:MM:SS] or scaled:<seconds per day>")
+    try: set_clock(parse_clock(parser.parse_args().clock))
+    except ValueError as e: parser.error(f"--clock: {e}")
     root = tk.Tk()
     app = PetApp(root)
     root.mainloop()
\ No newline at end of file